@@ -21,22 +21,28 @@ Usage:
 """
 
 import argparse
+import functools
 import json
 import os
 import sys
-from datetime import datetime, date, time, timedelta
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from datetime import datetime, date, time, timedelta, timezone
+from pathlib import Path
 from zoneinfo import ZoneInfo
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # ── Load .env ──────────────────────────────────────────────────────────────────
 _env_path = os.path.join(os.path.dirname(__file__) or ".", ".env")
-if os.path.isfile(_env_path):
-    with open(_env_path) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                k, v = line.split("=", 1)
-                os.environ.setdefault(k.strip(), v.strip().strip('"').strip("'"))
+try:
+    _env_lines = Path(_env_path).read_text(errors="ignore").splitlines()
+except OSError:
+    _env_lines = []
+_env_pairs = [l.split("=", 1) for l in map(str.strip, _env_lines) if l and not l.startswith("#") and "=" in l]
+# reversed() so the first occurrence of a key wins; real env vars always win
+os.environ.update({k.strip(): v.strip().strip('"').strip("'")
+                   for k, v in reversed(_env_pairs) if k.strip() not in os.environ})
 
 # ── Config ─────────────────────────────────────────────────────────────────────
 API = "https://api.clockify.me/api/v1"
@@ -50,30 +56,56 @@ START_TIME = os.environ.get("CLOCKIFY_START_TIME", "08:00")
 END_TIME = os.environ.get("CLOCKIFY_END_TIME", "16:00")
 AR_HOLIDAYS_API = "https://api.argentinadatos.com/v1/feriados"
 BILLABLE = True
+UTC = timezone.utc
+HTTP_CONCURRENCY = 8  # max POSTs in flight (stays well under Clockify's rate limit)
+
+# ── HTTP session ───────────────────────────────────────────────────────────────
+# One pooled session for every call: reuses TCP/TLS connections to Clockify.
+class ThrottleRetry(Retry):
+    # A 429 means the request was rejected, not processed, so resending a POST
+    # can't duplicate an entry; other POST failures still surface immediately.
+    def is_retry(self, method, status_code, has_retry_after=False):
+        if method.upper() == "POST":
+            return status_code == 429 and bool(self.total)
+        return super().is_retry(method, status_code, has_retry_after)
+
+SESSION = requests.Session()
+SESSION.headers.update({"X-Api-Key": API_KEY, "Content-Type": "application/json"})
+# Retries for Clockify only: the best-effort holiday fetch should fail fast.
+SESSION.mount("https://api.clockify.me/", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=HTTP_CONCURRENCY,
+    pool_block=True,
+    max_retries=ThrottleRetry(total=5, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                              respect_retry_after_header=True),
+))
 
 # ── API helpers ────────────────────────────────────────────────────────────────
-def hdrs():
-    return {"X-Api-Key": API_KEY, "Content-Type": "application/json"}
 
 def iso(dt_utc):
     return dt_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 def daterange(d1, d2):
-    d = d1
-    while d <= d2:
-        yield d
-        d += timedelta(days=1)
+    return map(date.fromordinal, range(d1.toordinal(), d2.toordinal() + 1))
 
+def workdays_in_range(d1, d2):
+    """Mon–Fri days in [d1, d2]. Ordinal 1 is a Monday, so ordinal % 7 is 6/0 on Sat/Sun."""
+    return [date.fromordinal(o) for o in range(d1.toordinal(), d2.toordinal() + 1) if o % 7 not in (0, 6)]
+
+# Account lookups don't change during a run: fetch each one at most once per process.
+@functools.lru_cache(maxsize=None)
 def get_user():
-    r = requests.get(f"{API}/user", headers=hdrs())
+    r = SESSION.get(f"{API}/user")
     r.raise_for_status()
     return r.json()
 
+@functools.lru_cache(maxsize=None)
 def get_workspaces():
-    r = requests.get(f"{API}/workspaces", headers=hdrs())
+    r = SESSION.get(f"{API}/workspaces")
     r.raise_for_status()
     return r.json()
 
+@functools.lru_cache(maxsize=None)
 def find_workspace_id():
     wss = get_workspaces()
     if not wss:
@@ -85,57 +117,65 @@ def find_workspace_id():
         sys.exit(f'Workspace "{WORKSPACE_NAME}" not found.')
     return wss[0]["id"]
 
+@functools.lru_cache(maxsize=None)
 def list_projects(ws_id):
-    r = requests.get(f"{API}/workspaces/{ws_id}/projects", headers=hdrs(), params={"page-size": 5000})
+    r = SESSION.get(f"{API}/workspaces/{ws_id}/projects", params={"page-size": 5000})
     r.raise_for_status()
     return r.json()
 
+@functools.lru_cache(maxsize=None)
+def project_ids_by_name(ws_id):
+    # Names can repeat across clients: keep the first one, like the old linear scan
+    return {p["name"]: p["id"] for p in reversed(list_projects(ws_id))}
+
 def find_project_id(ws_id):
-    for p in list_projects(ws_id):
-        if p["name"] == PROJECT_NAME:
-            return p["id"]
-    sys.exit(f'Project "{PROJECT_NAME}" not found.')
+    try:
+        return project_ids_by_name(ws_id)[PROJECT_NAME]
+    except KeyError:
+        sys.exit(f'Project "{PROJECT_NAME}" not found.')
 
+@functools.lru_cache(maxsize=None)
 def list_tags(ws_id):
-    r = requests.get(f"{API}/workspaces/{ws_id}/tags", headers=hdrs(), params={"page-size": 5000})
+    r = SESSION.get(f"{API}/workspaces/{ws_id}/tags", params={"page-size": 5000})
     r.raise_for_status()
     return r.json()
 
-def find_tag_id(ws_id, tag_name=None):
-    name = tag_name if tag_name is not None else TAG_NAME
-    for t in list_tags(ws_id):
-        if t["name"] == name:
-            return t["id"]
-    sys.exit(f'Tag "{name}" not found.')
+@functools.lru_cache(maxsize=None)
+def tag_ids_by_name(ws_id):
+    return {t["name"]: t["id"] for t in list_tags(ws_id)}
 
-def get_user_time_entries(ws_id, user_id, start_utc, end_utc, project_id=None):
-    params = {"start": iso(start_utc), "end": iso(end_utc), "page-size": 500}
+def find_tag_ids(ws_id, *names):
+    tags_by_name = tag_ids_by_name(ws_id)
+    try:
+        return [tags_by_name[name] for name in names]
+    except KeyError as e:
+        sys.exit(f'Tag "{e.args[0]}" not found.')
+
+def get_user_time_entries(ws_id, user_id, start_utc, end_utc, project_id=None, page_size=500):
+    # Clockify returns entries newest first, so page_size=1 yields just the latest one
+    params = {"start": iso(start_utc), "end": iso(end_utc), "page-size": page_size}
     if project_id:
         params["project"] = project_id
-    r = requests.get(f"{API}/workspaces/{ws_id}/user/{user_id}/time-entries", headers=hdrs(), params=params)
+    r = SESSION.get(f"{API}/workspaces/{ws_id}/user/{user_id}/time-entries", params=params)
     r.raise_for_status()
     return r.json()
 
 def entry_start_date(entry):
+    # Clockify sends YYYY-MM-DDTHH:MM:SSZ: the first 10 chars are the date
     s = entry.get("timeInterval", {}).get("start") or entry.get("start")
-    if not s:
-        return None
-    return datetime.fromisoformat(s.replace("Z", "+00:00")).date()
+    return date.fromisoformat(s[:10]) if s else None
 
 def get_last_date_with_entries(ws_id, user_id, project_id=None):
-    tz_utc = ZoneInfo("UTC")
-    end_utc = datetime.now(tz_utc)
+    end_utc = datetime.now(UTC)
     start_utc = end_utc - timedelta(days=400)
-    entries = get_user_time_entries(ws_id, user_id, start_utc, end_utc, project_id)
-    dates = [entry_start_date(e) for e in entries if entry_start_date(e)]
-    return max(dates) if dates else None
+    entries = get_user_time_entries(ws_id, user_id, start_utc, end_utc, project_id, page_size=1)
+    return entry_start_date(entries[0]) if entries else None
 
 def get_dates_with_entries_in_range(ws_id, user_id, d1, d2, project_id=None):
-    tz_utc = ZoneInfo("UTC")
-    start_utc = datetime.combine(d1, time(0, 0), tzinfo=tz_utc)
-    end_utc = datetime.combine(d2, time(23, 59, 59), tzinfo=tz_utc)
+    start_utc = datetime.combine(d1, time(0, 0), tzinfo=UTC)
+    end_utc = datetime.combine(d2, time(23, 59, 59), tzinfo=UTC)
     entries = get_user_time_entries(ws_id, user_id, start_utc, end_utc, project_id)
-    return {entry_start_date(e) for e in entries if entry_start_date(e)}
+    return {d for d in map(entry_start_date, entries) if d}
 
 def friday_of_week(d):
     w = d.weekday()
@@ -146,20 +186,40 @@ def friday_of_week(d):
 def monday_of_week(d):
     return d - timedelta(days=d.weekday())
 
+def work_hours_utc(tz):
+    """
+    Return day -> (start_utc, end_utc) for the START_TIME–END_TIME work day in `tz`.
+    The offset is looked up per day (DST, Ramadan and redefinitions all change it).
+    """
+    sh, sm = map(int, START_TIME.split(":"))
+    eh, em = map(int, END_TIME.split(":"))
+    start_t, end_t = time(sh, sm), time(eh, em)
+
+    def to_utc(day):
+        return (datetime.combine(day, start_t, tzinfo=tz).astimezone(UTC),
+                datetime.combine(day, end_t, tzinfo=tz).astimezone(UTC))
+
+    return to_utc
+
+def get_argentina_holidays(year):
+    """Holiday dates for `year`, or an empty list (with a warning) if the API fails."""
+    try:
+        # Third-party host: drop the Clockify credentials from the session headers.
+        r = SESSION.get(f"{AR_HOLIDAYS_API}/{year}", headers={"X-Api-Key": None}, timeout=10)
+        r.raise_for_status()
+        return [datetime.strptime(item["fecha"], "%Y-%m-%d").date() for item in r.json()]
+    except Exception as e:
+        print(f"Warning: could not load Argentina holidays for {year}: {e}", file=sys.stderr)
+        return []
+
 def get_argentina_holidays_in_range(d1, d2):
-    years = {d1.year, d2.year}
-    out = set()
-    for y in years:
-        try:
-            r = requests.get(f"{AR_HOLIDAYS_API}/{y}", timeout=10)
-            r.raise_for_status()
-            for item in r.json():
-                d = datetime.strptime(item["fecha"], "%Y-%m-%d").date()
-                if d1 <= d <= d2:
-                    out.add(d)
-        except Exception as e:
-            print(f"Warning: could not load Argentina holidays for {y}: {e}", file=sys.stderr)
-    return out
+    years = range(d1.year, d2.year + 1)
+    if len(years) <= 1:
+        per_year = list(map(get_argentina_holidays, years))
+    else:
+        with ThreadPoolExecutor(max_workers=len(years)) as ex:
+            per_year = list(ex.map(get_argentina_holidays, years))
+    return {d for days in per_year for d in days if d1 <= d <= d2}
 
 def create_entry(ws_id, start_utc, end_utc, description, project_id, tag_id):
     payload = {
@@ -170,10 +230,42 @@ def create_entry(ws_id, start_utc, end_utc, description, project_id, tag_id):
         "projectId": project_id,
         "tagIds": [tag_id],
     }
-    r = requests.post(f"{API}/workspaces/{ws_id}/time-entries", headers=hdrs(), json=payload)
+    r = SESSION.post(f"{API}/workspaces/{ws_id}/time-entries", json=payload)
     r.raise_for_status()
     return r.json()
 
+def create_entries(ws_id, entries, report):
+    """
+    Create (start_utc, end_utc, description, project_id, tag_id) entries concurrently,
+    calling report(index, created entry, error) as each POST finishes. After the first
+    failure, or on any interruption (Ctrl-C), the POSTs not yet started are cancelled;
+    the ones already in flight are waited for and still reported.
+    """
+    if not entries:
+        return
+    with ThreadPoolExecutor(max_workers=min(HTTP_CONCURRENCY, len(entries))) as ex:
+        futures = {ex.submit(create_entry, ws_id, *e): i for i, e in enumerate(entries)}
+        unreported = set(futures)
+
+        def done(fut):
+            unreported.discard(fut)
+            if fut.cancelled():
+                return
+            err = fut.exception()
+            if err is not None:
+                for f in unreported:
+                    f.cancel()
+            report(futures[fut], None if err else fut.result(), err)
+
+        try:
+            for fut in as_completed(futures):
+                done(fut)
+        finally:
+            for f in unreported:
+                f.cancel()
+            for fut in wait(unreported).done:
+                done(fut)
+
 # ── Core logic ─────────────────────────────────────────────────────────────────
 
 DAY_NAMES = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes", "Sábado", "Domingo"]
@@ -207,9 +299,7 @@ def build_day_list(start_date, end_date, ws_id, user_id, project_id, entries):
             desc_map[d] = entry.get("desc", "Work")
 
     days = []
-    for day in daterange(start_date, end_date):
-        if day.weekday() >= 5:  # skip weekends
-            continue
+    for day in workdays_in_range(start_date, end_date):
         if day in existing:
             continue
         is_holiday = day in holidays
@@ -237,13 +327,7 @@ def cmd_status():
     existing = get_dates_with_entries_in_range(ws_id, user_id, start_date, end_date, project_id)
     holidays = get_argentina_holidays_in_range(start_date, end_date)
 
-    pending = []
-    for day in daterange(start_date, end_date):
-        if day.weekday() >= 5:
-            continue
-        if day in existing:
-            continue
-        pending.append(day)
+    pending = [d for d in workdays_in_range(start_date, end_date) if d not in existing]
 
     if not pending:
         print("Clockify al día. No hay días pendientes.")
@@ -302,14 +386,14 @@ def cmd_preview_or_create(mode, desc=None, entries_json=None):
 
     hpd = hours_per_day()
     total_h = len(days) * hpd
-    work_days = [(d, desc_, hol) for d, desc_, hol in days if not hol]
-    holiday_days = [(d, desc_, hol) for d, desc_, hol in days if hol]
+    holidays_count = sum(1 for _, _, hol in days if hol)
+    workdays_count = len(days) - holidays_count
 
     print(f"{'PREVIEW' if mode == 'preview' else 'CREANDO ENTRADAS'}")
     print(f"{'─' * 40}")
     print(f"Último registro:  {last_date or 'ninguno'}")
     print(f"Rango:            {start_date} → {end_date}")
-    print(f"Días a crear:     {len(days)} ({len(work_days)} trabajo + {len(holiday_days)} feriados AR)")
+    print(f"Días a crear:     {len(days)} ({workdays_count} trabajo + {holidays_count} feriados AR)")
     print(f"Horario:          {START_TIME}–{END_TIME} ({hpd:.1f}h/día)")
     print(f"Total horas:      {total_h:.2f}h")
     print()
@@ -325,26 +409,41 @@ def cmd_preview_or_create(mode, desc=None, entries_json=None):
         return
 
     # ── CREATE ──
-    tz = ZoneInfo(TZ)
-    sh, sm = map(int, START_TIME.split(":"))
-    eh, em = map(int, END_TIME.split(":"))
-    tag_id = find_tag_id(ws_id)
-    holiday_tag_id = find_tag_id(ws_id, HOLIDAY_TAG_NAME)
+    to_utc = work_hours_utc(ZoneInfo(TZ))
+    tag_id, holiday_tag_id = find_tag_ids(ws_id, TAG_NAME, HOLIDAY_TAG_NAME)
 
     print()
-    created = 0
+    to_create = []
     for day, d, is_hol in days:
-        start_local = datetime.combine(day, time(sh, sm), tzinfo=tz)
-        end_local = datetime.combine(day, time(eh, em), tzinfo=tz)
-        start_utc = start_local.astimezone(ZoneInfo("UTC"))
-        end_utc = end_local.astimezone(ZoneInfo("UTC"))
+        start_utc, end_utc = to_utc(day)
         t_id = holiday_tag_id if is_hol else tag_id
-        create_entry(ws_id, start_utc, end_utc, d, project_id, t_id)
-        print(f"  [ok] {day} creado → {d}")
-        created += 1
+        to_create.append((start_utc, end_utc, d, project_id, t_id))
+
+    created, errors = set(), {}
+
+    def report(i, _, err):
+        day, d, _ = days[i]
+        if err is None:
+            created.add(i)
+            print(f"  [ok] {day} creado → {d}", flush=True)
+        else:
+            errors[i] = err
+            print(f"  [error] {day} falló: {err}", flush=True)
+
+    try:
+        create_entries(ws_id, to_create, report)
+        if errors:
+            raise errors[min(errors)]
+    except BaseException:
+        # Tell the caller exactly what was logged, so a retry doesn't duplicate entries
+        print()
+        print(f"ERROR: se crearon {len(created)} de {len(to_create)} entradas.")
+        print(f"Creados:    {', '.join(str(days[i][0]) for i in sorted(created)) or 'ninguno'}")
+        print(f"NO creados: {', '.join(str(days[i][0]) for i in range(len(days)) if i not in created)}")
+        raise
 
     print()
-    print(f"Listo. Entradas creadas: {created} | Total horas: {total_h:.2f}h")
+    print(f"Listo. Entradas creadas: {len(to_create)} | Total horas: {total_h:.2f}h")
 
 
 # ── Main ───────────────────────────────────────────────────────────────────────
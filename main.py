@@ -1,158 +1,385 @@
 #!/usr/bin/env python3
 import argparse
+import functools
+import hashlib
+import json
 import os
-from datetime import datetime, date, time, timedelta
-from zoneinfo import ZoneInfo
-import requests
-
-# Load .env if present (for CLOCKIFY_API_KEY without exporting manually)
-_env_path = os.path.join(os.path.dirname(__file__) or ".", ".env")
-if os.path.isfile(_env_path):
-    with open(_env_path) as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                k, v = line.split("=", 1)
-                os.environ.setdefault(k.strip(), v.strip().strip('"').strip("'"))
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from datetime import datetime, date, time, timedelta, timezone
+from pathlib import Path
+
+try:
+    import orjson  # optional: faster JSON encode/decode
+except ImportError:
+    orjson = None
 
 # python -m venv .venv && source .venv/bin/activate
 # python main.py --from 2025-08-01 --to 2025-08-31 --desc "Login Radius tickets"
 API = "https://api.clockify.me/api/v1"
 
 # API Key: CLOCKIFY_API_KEY env var or .env file (do not commit the real key)
-API_KEY = os.environ.get("CLOCKIFY_API_KEY", "PUT_YOUR_API_KEY_HERE")
-
-# Fixed configuration (can be overridden via env/.env)
-WORKSPACE_NAME = os.environ.get("CLOCKIFY_WORKSPACE_NAME") or None
-PROJECT_NAME = os.environ.get("CLOCKIFY_PROJECT_NAME", "NexStar")
-TAG_NAME = os.environ.get("CLOCKIFY_TAG_NAME", "PHP")
-HOLIDAY_TAG_NAME = os.environ.get("CLOCKIFY_HOLIDAY_TAG_NAME", "Vacation/Holiday")  # tag for holiday days (Argentina)
-TZ = os.environ.get("CLOCKIFY_TZ", "America/Bogota")
-START_TIME = os.environ.get("CLOCKIFY_START_TIME", "08:00")
-END_TIME = os.environ.get("CLOCKIFY_END_TIME", "16:00")
+API_KEY = "PUT_YOUR_API_KEY_HERE"
+
+# Fixed configuration (defaults; overridden via env/.env by load_config())
+WORKSPACE_NAME = None
+PROJECT_NAME = "NexStar"
+TAG_NAME = "PHP"
+HOLIDAY_TAG_NAME = "Vacation/Holiday"  # tag for holiday days (Argentina)
+TZ = "America/Bogota"
+START_TIME = "08:00"
+END_TIME = "16:00"
 BILLABLE = True
 
+UTC = timezone.utc
+
 # Argentina holidays API (no API key required)
 AR_HOLIDAYS_API = "https://api.argentinadatos.com/v1/feriados"
 
-def hdrs():
-    return {"X-Api-Key": API_KEY, "Content-Type": "application/json"}
+# Local cache for slow-changing API data (holidays, workspaces, projects, tags)
+CACHE_DIR = Path.home() / ".cache" / "nimble-clockify"
+CACHE_TTL = 24 * 60 * 60  # seconds
+
+STALE_HINT = f" (lists are cached for a day; delete {CACHE_DIR} to refresh)"
+
+# Max concurrent requests to one host (stays well under Clockify's rate limit).
+# Also the size of the keep-alive pool, so parallel POSTs share these connections.
+HTTP_CONCURRENCY = 8
+
+# Work-day schedule for the default START_TIME/END_TIME; main() re-parses it via
+# _parse_schedule() once the overrides are loaded.
+_SH, _SM, _EH, _EM = 8, 0, 16, 0
+HOURS_PER_DAY = 8.0
+
+def _parse_schedule():
+    """
+    Split START_TIME/END_TIME (HH:MM) into the hour/minute constants and HOURS_PER_DAY.
+    Only the entry-creating paths call this, so a bad value can't break --help/--list.
+    """
+    global _SH, _SM, _EH, _EM, HOURS_PER_DAY
+    try:
+        (sh, sm), (eh, em) = (map(int, t.split(":")) for t in (START_TIME, END_TIME))
+        time(sh, sm), time(eh, em)  # range check
+    except ValueError:
+        raise SystemExit(f'Invalid work schedule "{START_TIME}" - "{END_TIME}": '
+                         "use HH:MM for CLOCKIFY_START_TIME/CLOCKIFY_END_TIME.")
+    _SH, _SM, _EH, _EM = sh, sm, eh, em
+    HOURS_PER_DAY = (_EH - _SH) + (_EM - _SM) / 60
+
+def load_config():
+    """
+    Load .env if present (for CLOCKIFY_API_KEY without exporting manually) and apply
+    the CLOCKIFY_* overrides. Called from main(), so importing this module stays cheap.
+    """
+    global API_KEY, WORKSPACE_NAME, PROJECT_NAME, TAG_NAME, HOLIDAY_TAG_NAME, TZ, START_TIME, END_TIME
+    env_path = os.path.join(os.path.dirname(__file__) or ".", ".env")
+    try:
+        lines = Path(env_path).read_text(errors="ignore").splitlines()
+    except OSError:
+        lines = []
+    pairs = [l.split("=", 1) for l in map(str.strip, lines) if l and not l.startswith("#") and "=" in l]
+    # reversed() so the first occurrence of a key wins; real env vars always win
+    os.environ.update({k.strip(): v.strip().strip('"').strip("'")
+                       for k, v in reversed(pairs) if k.strip() not in os.environ})
+
+    env = os.environ
+    API_KEY = env.get("CLOCKIFY_API_KEY", API_KEY)
+    WORKSPACE_NAME = env.get("CLOCKIFY_WORKSPACE_NAME") or WORKSPACE_NAME
+    PROJECT_NAME = env.get("CLOCKIFY_PROJECT_NAME", PROJECT_NAME)
+    TAG_NAME = env.get("CLOCKIFY_TAG_NAME", TAG_NAME)
+    HOLIDAY_TAG_NAME = env.get("CLOCKIFY_HOLIDAY_TAG_NAME", HOLIDAY_TAG_NAME)
+    TZ = env.get("CLOCKIFY_TZ", TZ)
+    START_TIME = env.get("CLOCKIFY_START_TIME", START_TIME)
+    END_TIME = env.get("CLOCKIFY_END_TIME", END_TIME)
+
+_session = None
+_session_lock = threading.Lock()
+
+def session():
+    """
+    The pooled HTTP session shared by every call: reuses TCP/TLS connections instead
+    of handshaking with api.clockify.me on each request. Built on first use, so
+    --help and argument errors don't pay for importing requests.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util.retry import Retry
+
+            class ThrottleRetry(Retry):
+                # A 429 means the request was rejected, not processed, so resending a POST
+                # can't duplicate an entry; other POST failures still surface immediately.
+                def is_retry(self, method, status_code, has_retry_after=False):
+                    if method.upper() == "POST":
+                        return status_code == 429 and bool(self.total)
+                    return super().is_retry(method, status_code, has_retry_after)
+
+            s = requests.Session()
+            s.headers.update({
+                "X-Api-Key": API_KEY,
+                "Content-Type": "application/json",
+            })
+            # Clockify only: the holiday API keeps the plain adapter (no retries), so an
+            # unreachable third-party host fails fast instead of backing off.
+            s.mount("https://api.clockify.me/", HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=HTTP_CONCURRENCY,
+                pool_block=True,  # wait for a pooled connection rather than open a throwaway one
+                max_retries=ThrottleRetry(total=5, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                                          respect_retry_after_header=True),
+            ))
+            _session = s
+    return _session
+
+def _loads(body: bytes):
+    return orjson.loads(body) if orjson else json.loads(body)
+
+def _dumps(obj) -> bytes:
+    return orjson.dumps(obj) if orjson else json.dumps(obj).encode()
+
+def _cache_path(url, params=None):
+    key = hashlib.sha1(json.dumps([API_KEY, url, params], sort_keys=True).encode()).hexdigest()
+    return CACHE_DIR / f"{key}.json"
+
+def _cached_get(url, ttl, params=None, **kwargs):
+    """
+    GET `url` through session() and return the decoded JSON, reusing a copy kept in
+    CACHE_DIR for up to `ttl` seconds. Cache errors only ever mean a fresh fetch.
+    """
+    path = _cache_path(url, params)
+    now = datetime.now().timestamp()
+    try:
+        cached = _loads(path.read_bytes())
+        if now - cached["ts"] < ttl:
+            return cached["body"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    r = session().get(url, params=params, **kwargs)
+    r.raise_for_status()
+    body = _loads(r.content)
+    try:
+        CACHE_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        path.write_bytes(_dumps({"ts": now, "body": body}))
+    except OSError:
+        pass
+    return body
 
 def iso(dt_utc):
-    return dt_utc.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return (f"{dt_utc.year:04d}-{dt_utc.month:02d}-{dt_utc.day:02d}"
+            f"T{dt_utc.hour:02d}:{dt_utc.minute:02d}:{dt_utc.second:02d}Z")
 
 def ymd(s):
     return datetime.strptime(s, "%Y-%m-%d").date()
 
 def daterange(d1: date, d2: date):
-    d = d1
-    while d <= d2:
-        yield d
-        d += timedelta(days=1)
-
+    return map(date.fromordinal, range(d1.toordinal(), d2.toordinal() + 1))
+
+def workdays_in_range(d1: date, d2: date, include_weekends=False):
+    """List the days in [d1, d2], skipping Sat/Sun unless include_weekends."""
+    if include_weekends:
+        return list(daterange(d1, d2))
+    # Ordinal 1 (0001-01-01) is a Monday, so ordinal % 7 is 6 on Saturdays and 0 on Sundays.
+    return [date.fromordinal(o) for o in range(d1.toordinal(), d2.toordinal() + 1) if o % 7 not in (0, 6)]
+
+def count_weekdays(d1: date, d2: date):
+    """Number of Mon–Fri days in [d1, d2], in constant time."""
+    if d2 < d1:
+        return 0
+    weeks, rest = divmod((d2 - d1).days + 1, 7)
+    first = d1.weekday()
+    return weeks * 5 + sum(1 for i in range(rest) if (first + i) % 7 < 5)
+
+# Account lookups don't change during a run: fetch each one at most once per process.
+@functools.lru_cache(maxsize=None)
 def get_user():
-    r = requests.get(f"{API}/user", headers=hdrs())
+    r = session().get(f"{API}/user")
     r.raise_for_status()
-    return r.json()
+    return _loads(r.content)
 
-def get_workspaces():
-    r = requests.get(f"{API}/workspaces", headers=hdrs())
-    r.raise_for_status()
-    return r.json()
+# fresh=True skips the disk cache (and refreshes it): --list/--list-tags must show current data.
+@functools.lru_cache(maxsize=None)
+def get_workspaces(fresh=False):
+    return _cached_get(f"{API}/workspaces", 0 if fresh else CACHE_TTL)
 
-def find_workspace_id():
-    wss = get_workspaces()
+@functools.lru_cache(maxsize=None)
+def find_workspace_id(fresh=False):
+    wss = get_workspaces(fresh)
     if not wss:
         raise SystemExit("No workspaces found in your account.")
     if WORKSPACE_NAME:
         for ws in wss:
             if ws["name"] == WORKSPACE_NAME:
                 return ws["id"]
-        raise SystemExit(f'Workspace "{WORKSPACE_NAME}" not found.')
+        raise SystemExit(f'Workspace "{WORKSPACE_NAME}" not found.{"" if fresh else STALE_HINT}')
     return wss[0]["id"]
 
-def list_projects(ws_id):
-    r = requests.get(f"{API}/workspaces/{ws_id}/projects",
-                     headers=hdrs(), params={"page-size":5000})
-    r.raise_for_status()
-    return r.json()
+@functools.lru_cache(maxsize=None)
+def list_projects(ws_id, fresh=False):
+    return _cached_get(f"{API}/workspaces/{ws_id}/projects", 0 if fresh else CACHE_TTL, params={"page-size":5000})
+
+@functools.lru_cache(maxsize=None)
+def project_ids_by_name(ws_id):
+    """Map project name → project ID (names can repeat across clients: first one wins)."""
+    return {p["name"]: p["id"] for p in reversed(list_projects(ws_id))}
 
 def find_project_id(ws_id):
-    for p in list_projects(ws_id):
-        if p["name"] == PROJECT_NAME:
-            return p["id"]
-    raise SystemExit(f'Project "{PROJECT_NAME}" not found in the workspace.')
-
-def list_tags(ws_id):
-    r = requests.get(f"{API}/workspaces/{ws_id}/tags",
-                     headers=hdrs(), params={"page-size":5000})
-    r.raise_for_status()
-    return r.json()
+    try:
+        return project_ids_by_name(ws_id)[PROJECT_NAME]
+    except KeyError:
+        raise SystemExit(f'Project "{PROJECT_NAME}" not found in the workspace.{STALE_HINT}')
+
+@functools.lru_cache(maxsize=None)
+def list_tags(ws_id, fresh=False):
+    return _cached_get(f"{API}/workspaces/{ws_id}/tags", 0 if fresh else CACHE_TTL, params={"page-size":5000})
+
+def forget_catalogs(ws_id):
+    """Drop the cached project/tag lists of the workspace so the next run refetches them."""
+    for kind in ("projects", "tags"):
+        try:
+            _cache_path(f"{API}/workspaces/{ws_id}/{kind}", {"page-size":5000}).unlink()
+        except OSError:
+            pass
+
+@functools.lru_cache(maxsize=None)
+def tag_ids_by_name(ws_id):
+    """Map tag name → tag ID for the workspace."""
+    return {t["name"]: t["id"] for t in list_tags(ws_id)}
+
+def find_tag_ids(ws_id, *names):
+    """Resolve several tag names to IDs with a single pass over the tag list."""
+    tags_by_name = tag_ids_by_name(ws_id)
+    try:
+        return [tags_by_name[name] for name in names]
+    except KeyError as e:
+        raise SystemExit(f'Tag "{e.args[0]}" not found in the workspace.{STALE_HINT}')
 
 def find_tag_id(ws_id, tag_name=None):
-    name = tag_name if tag_name is not None else TAG_NAME
-    for t in list_tags(ws_id):
-        if t["name"] == name:
-            return t["id"]
-    raise SystemExit(f'Tag "{name}" not found in the workspace.')
-
-def create_entry(ws_id, start_utc, end_utc, description, project_id, tag_id):
-    payload = {
-        "start": iso(start_utc),
-        "end": iso(end_utc),
-        "billable": BILLABLE,
-        "description": description,
-        "projectId": project_id,
-        "tagIds": [tag_id],
-    }
-    r = requests.post(f"{API}/workspaces/{ws_id}/time-entries",
-                      headers=hdrs(), json=payload)
+    return find_tag_ids(ws_id, tag_name if tag_name is not None else TAG_NAME)[0]
+
+def entry_base(project_id, tag_id):
+    """
+    The body fields shared by every entry in a run, serialized once as a JSON
+    object without its closing brace; entry_payload() appends the per-day fields.
+    """
+    return _dumps({"billable": BILLABLE, "projectId": project_id, "tagIds": [tag_id]})[:-1]
+
+def entry_payload(start_utc, end_utc, description, base):
+    """Complete JSON body (bytes) for one entry: `base` plus start/end/description."""
+    return b'%s,"start":"%s","end":"%s","description":%s}' % (
+        base, iso(start_utc).encode(), iso(end_utc).encode(), _dumps(description))
+
+def create_entry(ws_id, payload):
+    r = session().post(f"{API}/workspaces/{ws_id}/time-entries", data=payload)
     r.raise_for_status()
-    return r.json()
+    return _loads(r.content)
+
+def create_entries(ws_id, payloads, report):
+    """
+    Create a batch of time entries (bodies from entry_payload()), calling
+    report(index, created entry, error) as each POST finishes. Clockify has no
+    bulk-create endpoint, so the POSTs are sent concurrently over the pooled
+    session instead. After the first failure, or if anything interrupts the batch
+    (Ctrl-C), the POSTs not yet started are cancelled; the ones already in flight
+    are waited for and still reported.
+    """
+    if not payloads:
+        return
+    with ThreadPoolExecutor(max_workers=min(HTTP_CONCURRENCY, len(payloads))) as ex:
+        futures = {ex.submit(create_entry, ws_id, p): i for i, p in enumerate(payloads)}
+        unreported = set(futures)
+
+        def done(fut):
+            unreported.discard(fut)
+            if fut.cancelled():
+                return
+            err = fut.exception()
+            if err is not None:
+                for f in unreported:
+                    f.cancel()
+            report(futures[fut], None if err else fut.result(), err)
+
+        try:
+            for fut in as_completed(futures):
+                done(fut)
+        finally:
+            for f in unreported:
+                f.cancel()
+            for fut in wait(unreported).done:
+                done(fut)
+
+def submit_entries(ws_id, payloads, days, ok_line):
+    """
+    Create the entries, printing ok_line(index, entry) as soon as each one exists.
+    If a POST fails or the run is interrupted, list which days were created and
+    which weren't (so a re-run doesn't duplicate them) and re-raise.
+    """
+    created, errors = set(), {}
 
-def get_user_time_entries(ws_id, user_id, start_utc, end_utc, project_id=None):
-    """Fetch user time entries in the workspace for the range [start_utc, end_utc]."""
+    def report(i, te, err):
+        # flush: progress must reach a pipe/log even if a later POST kills the run
+        if err is None:
+            created.add(i)
+            print(ok_line(i, te), flush=True)
+        else:
+            errors[i] = err
+            print(f"[error] {days[i]} failed: {err}", flush=True)
+
+    try:
+        create_entries(ws_id, payloads, report)
+        if errors:
+            raise errors[min(errors)]
+    except BaseException:
+        print(f"\nStopped before finishing. Entries created: {len(created)} of {len(payloads)}")
+        print(f"   Created: {', '.join(str(days[i]) for i in sorted(created)) or 'none'}")
+        print(f"   NOT created: {', '.join(str(days[i]) for i in range(len(days)) if i not in created)}")
+        # A 4xx usually means a project/tag was deleted or recreated since it was cached
+        if any(400 <= getattr(getattr(e, "response", None), "status_code", 0) < 500 for e in errors.values()):
+            forget_catalogs(ws_id)
+            print("   Clockify rejected an entry; the cached project/tag IDs were cleared, so re-running refetches them.")
+        raise
+
+def get_user_time_entries(ws_id, user_id, start_utc, end_utc, project_id=None, page_size=500):
+    """
+    Fetch user time entries in the workspace for the range [start_utc, end_utc].
+    Clockify returns them newest first, so page_size=1 yields just the latest entry.
+    """
     params = {
         "start": iso(start_utc),
         "end": iso(end_utc),
-        "page-size": 500,
+        "page-size": page_size,
     }
     if project_id:
         params["project"] = project_id
-    r = requests.get(
-        f"{API}/workspaces/{ws_id}/user/{user_id}/time-entries",
-        headers=hdrs(),
-        params=params,
-    )
+    r = session().get(f"{API}/workspaces/{ws_id}/user/{user_id}/time-entries", params=params)
     r.raise_for_status()
-    return r.json()
+    return _loads(r.content)
 
 def _entry_start_date(entry):
-    """Extract the date from a time entry's start."""
+    """Extract the date from a time entry's start (Clockify sends YYYY-MM-DDTHH:MM:SSZ)."""
     s = entry.get("timeInterval", {}).get("start") or entry.get("start")
-    if not s:
-        return None
-    return datetime.fromisoformat(s.replace("Z", "+00:00")).date()
+    return date.fromisoformat(s[:10]) if s else None
 
 def get_last_date_with_entries(ws_id, user_id, project_id=None):
     """
     Return the latest date on which the user has at least one entry in this project/workspace.
     Returns None if there are no entries.
     """
-    tz_utc = ZoneInfo("UTC")
-    end_utc = datetime.now(tz_utc)
+    end_utc = datetime.now(UTC)
     start_utc = end_utc - timedelta(days=400)
-    entries = get_user_time_entries(ws_id, user_id, start_utc, end_utc, project_id)
-    dates = [_entry_start_date(e) for e in entries if _entry_start_date(e)]
-    return max(dates) if dates else None
+    # Newest first: a single-entry page is exactly the latest one
+    entries = get_user_time_entries(ws_id, user_id, start_utc, end_utc, project_id, page_size=1)
+    return _entry_start_date(entries[0]) if entries else None
 
 def get_dates_with_entries_in_range(ws_id, user_id, d1, d2, project_id=None):
     """Return a set of dates that already have at least one entry in [d1, d2]."""
-    tz_utc = ZoneInfo("UTC")
-    start_utc = datetime.combine(d1, time(0, 0), tzinfo=tz_utc)
-    end_utc = datetime.combine(d2, time(23, 59, 59), tzinfo=tz_utc)
+    start_utc = datetime.combine(d1, time(0, 0), tzinfo=UTC)
+    end_utc = datetime.combine(d2, time(23, 59, 59), tzinfo=UTC)
     entries = get_user_time_entries(ws_id, user_id, start_utc, end_utc, project_id)
-    return {_entry_start_date(e) for e in entries if _entry_start_date(e)}
+    return {d for d in map(_entry_start_date, entries) if d}
 
 def friday_of_week(d: date):
     """Friday of the week containing d. If d is Sat/Sun, returns the previous Friday."""
@@ -165,52 +392,80 @@ def monday_of_week(d: date):
     """Monday of the week containing d."""
     return d - timedelta(days=d.weekday())
 
+def work_hours_utc(tz):
+    """
+    Return a function mapping a day to the (start_utc, end_utc) of its
+    START_TIME–END_TIME work day in `tz`. The offset is looked up per day:
+    zones change it for DST, Ramadan and outright redefinitions.
+    """
+    start_t, end_t = time(_SH, _SM), time(_EH, _EM)
+
+    def to_utc(day: date):
+        return (datetime.combine(day, start_t, tzinfo=tz).astimezone(UTC),
+                datetime.combine(day, end_t, tzinfo=tz).astimezone(UTC))
+
+    return to_utc
+
+@functools.lru_cache(maxsize=8)
 def get_argentina_holidays(year: int):
     """Fetch Argentina public holidays for a year (ArgentinaDatos API, no API key)."""
-    r = requests.get(f"{AR_HOLIDAYS_API}/{year}", timeout=10)
-    r.raise_for_status()
-    data = r.json()
-    return [datetime.strptime(item["fecha"], "%Y-%m-%d").date() for item in data]
+    # Third-party host: drop the Clockify credentials from the session headers.
+    data = _cached_get(f"{AR_HOLIDAYS_API}/{year}", CACHE_TTL, headers={"X-Api-Key": None}, timeout=10)
+    return [date.fromisoformat(item["fecha"]) for item in data]
 
 def get_argentina_holidays_in_range(d1: date, d2: date):
     """Return a set of dates that are Argentina public holidays in [d1, d2]."""
-    years = {d1.year, d2.year}
-    out = set()
-    for y in years:
+    import requests
+
+    def fetch(y):
         try:
-            for d in get_argentina_holidays(y):
-                if d1 <= d <= d2:
-                    out.add(d)
-        except requests.RequestException as e:
+            return get_argentina_holidays(y)
+        except (requests.RequestException, ValueError) as e:  # ValueError: body isn't JSON (json/orjson)
             raise SystemExit(f"Failed to load Argentina holidays ({y}): {e}")
-    return out
+
+    years = range(d1.year, d2.year + 1)
+    if len(years) <= 1:
+        per_year = list(map(fetch, years))
+    else:
+        # Ranges crossing New Year: fetch each year's list concurrently
+        with ThreadPoolExecutor(max_workers=len(years)) as ex:
+            per_year = list(ex.map(fetch, years))
+    return {d for days in per_year for d in days if d1 <= d <= d2}
 
 def list_workspaces_and_projects():
     """List all workspaces and projects with their IDs."""
     print("🔍 AVAILABLE WORKSPACES:")
     print("=" * 50)
 
-    workspaces = get_workspaces()
-    for i, ws in enumerate(workspaces, 1):
-        print(f"{i}. {ws['name']} (ID: {ws['id']})")
-
+    def safe_list_projects(ws):
         try:
-            projects = list_projects(ws['id'])
-            if projects:
-                print("   📁 Projects:")
-                for j, proj in enumerate(projects, 1):
-                    print(f"      {j}. {proj['name']} (ID: {proj['id']})")
-            else:
-                print("   📁 No projects")
+            return list_projects(ws['id'], fresh=True)
         except Exception as e:
-            print(f"   ❌ Error fetching projects: {e}")
+            return e
+
+    workspaces = get_workspaces(fresh=True)
+    # One GET per workspace: fetch them all concurrently, then print in order
+    with ThreadPoolExecutor(max_workers=max(1, min(HTTP_CONCURRENCY, len(workspaces)))) as ex:
+        projects_per_ws = list(ex.map(safe_list_projects, workspaces))
+
+    for i, (ws, projects) in enumerate(zip(workspaces, projects_per_ws), 1):
+        print(f"{i}. {ws['name']} (ID: {ws['id']})")
+
+        if isinstance(projects, Exception):
+            print(f"   ❌ Error fetching projects: {projects}")
+        elif projects:
+            print("   📁 Projects:")
+            for j, proj in enumerate(projects, 1):
+                print(f"      {j}. {proj['name']} (ID: {proj['id']})")
+        else:
+            print("   📁 No projects")
         print()
 
     print("🏷️  AVAILABLE TAGS:")
     print("=" * 50)
     if workspaces:
         try:
-            tags = list_tags(workspaces[0]['id'])
+            tags = list_tags(workspaces[0]['id'], fresh=True)
             for i, tag in enumerate(tags, 1):
                 print(f"{i}. {tag['name']} (ID: {tag['id']})")
         except Exception as e:
@@ -224,16 +479,15 @@ def list_workspaces_and_projects():
 
 def list_tags_and_validate_holiday():
     """List all tags in the workspace and validate that the holiday tag exists."""
-    ws_id = find_workspace_id()
+    ws_id = find_workspace_id(fresh=True)
     print("🏷️  TAGS IN YOUR WORKSPACE:")
     print("=" * 50)
-    tags = list_tags(ws_id)
+    tags = list_tags(ws_id, fresh=True)
     for i, t in enumerate(tags, 1):
         mark = " ← holidays" if t["name"] == HOLIDAY_TAG_NAME else ""
         print(f"   {i}. {t['name']} (ID: {t['id']}){mark}")
     print()
-    found = any(t["name"] == HOLIDAY_TAG_NAME for t in tags)
-    if found:
+    if any(t["name"] == HOLIDAY_TAG_NAME for t in tags):
         print(f"   ✅ Holiday tag '{HOLIDAY_TAG_NAME}' found.")
     else:
         print(f"   ❌ Holiday tag '{HOLIDAY_TAG_NAME}' does NOT exist.")
@@ -247,15 +501,16 @@ def run_weekly_interactive():
     don't have any yet (Mon–Fri; Argentina holidays get Holiday tag).
     """
     today = date.today()
-    user = get_user()
-    user_id = user["id"]
-    ws_id = find_workspace_id()
-    project_id = find_project_id(ws_id)
-    tag_id = find_tag_id(ws_id)
-    holiday_tag_id = find_tag_id(ws_id, HOLIDAY_TAG_NAME)
-    tz = ZoneInfo(TZ)
-    sh, sm = map(int, START_TIME.split(":"))
-    eh, em = map(int, END_TIME.split(":"))
+    # The user and the workspace's project/tags are independent lookups: overlap them
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        user_fut = ex.submit(get_user)
+        ws_id = find_workspace_id()
+        tags_fut = ex.submit(find_tag_ids, ws_id, TAG_NAME, HOLIDAY_TAG_NAME)
+        project_id = find_project_id(ws_id)
+        user_id = user_fut.result()["id"]
+        tag_id, holiday_tag_id = tags_fut.result()
+    from zoneinfo import ZoneInfo  # deferred: --list/--list-tags never need tzdata
+    to_utc = work_hours_utc(ZoneInfo(TZ))
 
     print("📅 Weekly mode: upload hours from the last day with entries to this week's Friday.")
     print("   (Mon–Fri only; days that already have entries are skipped; Argentina holidays → Holiday.)")
@@ -274,27 +529,22 @@ def run_weekly_interactive():
     existing_dates = get_dates_with_entries_in_range(ws_id, user_id, start_date, end_date, project_id)
     holidays_set = get_argentina_holidays_in_range(start_date, end_date)
 
-    to_create = []
-    for day in daterange(start_date, end_date):
-        if day.weekday() >= 5:
-            continue
-        if day in existing_dates:
-            continue
-        to_create.append(day)
-
-    if not to_create:
+    # Partition the pending days with set ops instead of per-day membership checks
+    candidate_days = set(workdays_in_range(start_date, end_date)) - existing_dates
+    if not candidate_days:
         print("All workdays in the range already have entries. Nothing to create.")
         return
 
-    workdays_count = len([d for d in to_create if d not in holidays_set])
-    holidays_count = len([d for d in to_create if d in holidays_set])
-    hours_per_day = (eh - sh) + (em - sm) / 60
-    total_hours = len(to_create) * hours_per_day
+    holiday_days = candidate_days & holidays_set
+    work_days = candidate_days - holiday_days
+    holidays_count = len(holiday_days)
+    workdays_count = len(work_days)
+    total_hours = len(candidate_days) * HOURS_PER_DAY
 
     print(f"📅 SUMMARY:")
     print(f"   Last day with entries: {last_date or 'none'}")
     print(f"   Range to create: {start_date} → {end_date}")
-    print(f"   Days to create: {len(to_create)} ({workdays_count} work + {holidays_count} Argentina holidays)")
+    print(f"   Days to create: {len(candidate_days)} ({workdays_count} work + {holidays_count} Argentina holidays)")
     print(f"   Description (work): {desc}")
     print(f"   Total hours: {total_hours:.2f}h")
     print()
@@ -304,40 +554,28 @@ def run_weekly_interactive():
         print("Cancelled.")
         return
 
-    created = 0
-    for day in to_create:
-        start_local = datetime.combine(day, time(sh, sm), tzinfo=tz)
-        end_local = datetime.combine(day, time(eh, em), tzinfo=tz)
-        start_utc = start_local.astimezone(ZoneInfo("UTC"))
-        end_utc = end_local.astimezone(ZoneInfo("UTC"))
-        is_holiday = day in holidays_set
-        day_desc = "Holiday" if is_holiday else desc
-        t_id = holiday_tag_id if is_holiday else tag_id
-        te = create_entry(ws_id, start_utc, end_utc, day_desc, project_id, t_id)
-        print(f"[ok] {day} created ({day_desc})")
-        created += 1
+    work_base = entry_base(project_id, tag_id)
+    holiday_base = entry_base(project_id, holiday_tag_id)
+    # The two sets are disjoint, so sorting the tuples only ever compares dates
+    to_create = sorted([(d, desc, work_base) for d in work_days] +
+                       [(d, "Holiday", holiday_base) for d in holiday_days])
+    payloads = [entry_payload(*to_utc(day), day_desc, base) for day, day_desc, base in to_create]
+
+    submit_entries(ws_id, payloads, [day for day, _, _ in to_create],
+                   lambda i, te: f"[ok] {to_create[i][0]} created ({to_create[i][1]})")
 
-    print(f"\nDone. Entries created: {created} | Total hours: {total_hours:.2f}h")
+    print(f"\nDone. Entries created: {len(payloads)} | Total hours: {total_hours:.2f}h")
 
 def calculate_hours(d1: date, d2: date, include_weekends=False):
     """Compute total work hours in the date range."""
-    total_hours = 0
-    workdays = 0
-
-    for day in daterange(d1, d2):
-        if not include_weekends and day.weekday() >= 5:  # skip Sat/Sun
-            continue
-        workdays += 1
-
-    sh, sm = map(int, START_TIME.split(":"))
-    eh, em = map(int, END_TIME.split(":"))
-    hours_per_day = (eh - sh) + (em - sm) / 60
-
-    total_hours = workdays * hours_per_day
-
-    return workdays, total_hours, hours_per_day
+    if include_weekends:
+        workdays = max((d2 - d1).days + 1, 0)
+    else:
+        workdays = count_weekdays(d1, d2)
+    return workdays, workdays * HOURS_PER_DAY, HOURS_PER_DAY
 
 def main():
+    load_config()
     ap = argparse.ArgumentParser(description="Log Mon–Fri hours to Clockify with Argentina holidays support.")
     ap.add_argument("--list", action="store_true", help="List workspaces, projects, and tags")
     ap.add_argument("--list-tags", action="store_true", help="List tags and validate holiday tag (Vacation/Holiday)")
@@ -356,6 +594,8 @@ def main():
         list_tags_and_validate_holiday()
         return
 
+    _parse_schedule()
+
     # Interactive weekly mode: no --from/--to/--desc → ask description, use last entry date to this week's Friday
     if not args.from_date and not args.to_date and not args.desc:
         run_weekly_interactive()
@@ -364,18 +604,38 @@ def main():
     if not all([args.from_date, args.to_date, args.desc]):
         ap.error("--from, --to, and --desc are required to create time entries (or run with no args for weekly mode).")
 
-    ws_id = find_workspace_id()
-    project_id = find_project_id(ws_id)
-    tag_id = find_tag_id(ws_id)
-    holiday_tag_id = find_tag_id(ws_id, HOLIDAY_TAG_NAME)
-    tz = ZoneInfo(TZ)
-
+    from zoneinfo import ZoneInfo  # deferred: --list/--list-tags never need tzdata
+    to_utc = work_hours_utc(ZoneInfo(TZ))
     d1, d2 = ymd(args.from_date), ymd(args.to_date)
-    holidays_set = get_argentina_holidays_in_range(d1, d2)
+
+    ws_id = project_id = tag_id = holiday_tag_id = None
+    if args.dry_run:
+        # Dry-run only needs the holidays: skip the Clockify lookups entirely
+        holidays_set = get_argentina_holidays_in_range(d1, d2)
+    else:
+        # Holidays, project and tags don't depend on each other: fetch them concurrently
+        with ThreadPoolExecutor(max_workers=3) as ex:
+            holidays_fut = ex.submit(get_argentina_holidays_in_range, d1, d2)
+            ws_id = find_workspace_id()
+            tags_fut = ex.submit(tag_ids_by_name, ws_id)
+            project_id = find_project_id(ws_id)
+            holidays_set = holidays_fut.result()
+            tags_fut.result()
+        if holidays_set:
+            tag_id, holiday_tag_id = find_tag_ids(ws_id, TAG_NAME, HOLIDAY_TAG_NAME)
+        else:
+            tag_id = find_tag_id(ws_id)
+
+    days, descs = [], []
+    holidays_in_scope = 0
+    for day in workdays_in_range(d1, d2, args.include_weekends):
+        is_holiday = day in holidays_set
+        holidays_in_scope += is_holiday
+        days.append(day)
+        descs.append("Holiday" if is_holiday else args.desc)
 
     # Compute and show total hours
     workdays, total_hours, hours_per_day = calculate_hours(d1, d2, args.include_weekends)
-    holidays_in_scope = sum(1 for d in holidays_set if args.include_weekends or d.weekday() < 5)
     print(f"📅 SUMMARY:")
     print(f"   Range: {d1} → {d2}")
     print(f"   Days to create: {workdays} ({workdays - holidays_in_scope} work + {holidays_in_scope} Argentina holidays)")
@@ -385,33 +645,21 @@ def main():
     print(f"   Include weekends: {'Yes' if args.include_weekends else 'No'}")
     print()
 
-    sh, sm = map(int, START_TIME.split(":"))
-    eh, em = map(int, END_TIME.split(":"))
-
-    created = 0
-    for day in daterange(d1, d2):
-        if not args.include_weekends and day.weekday() >= 5:  # skip Sat/Sun
-            continue
-
-        start_local = datetime.combine(day, time(sh, sm), tzinfo=tz)
-        end_local   = datetime.combine(day, time(eh, em), tzinfo=tz)
-        start_utc = start_local.astimezone(ZoneInfo("UTC"))
-        end_utc   = end_local.astimezone(ZoneInfo("UTC"))
-
-        is_holiday = day in holidays_set
-        desc = "Holiday" if is_holiday else args.desc
-        t_id = holiday_tag_id if is_holiday else tag_id
-
-        if args.dry_run:
-            label = "Holiday" if is_holiday else args.desc
-            print(f"[DRY-RUN] {day} | {START_TIME}-{END_TIME} | {label}")
-        else:
-            te = create_entry(ws_id, start_utc, end_utc, desc, project_id, t_id)
-            print(f"[ok] {day} created id={te.get('id')} ({desc})")
-        created += 1
+    if args.dry_run:
+        # Nothing can fail mid-way here, so the lines are written in one go
+        sys.stdout.write("".join(f"[DRY-RUN] {day} | {START_TIME}-{END_TIME} | {desc}\n"
+                                 for day, desc in zip(days, descs)))
+    else:
+        # Payloads are only serialized for a real run; dry-run never sends them
+        work_base = entry_base(project_id, tag_id)
+        holiday_base = entry_base(project_id, holiday_tag_id)
+        payloads = [entry_payload(*to_utc(day), desc, holiday_base if day in holidays_set else work_base)
+                    for day, desc in zip(days, descs)]
+        submit_entries(ws_id, payloads, days,
+                       lambda i, te: f"[ok] {days[i]} created id={te.get('id')} ({descs[i]})")
 
     mode = "DRY-RUN (simulated)" if args.dry_run else "real"
-    print(f"\nDone. Entries {mode}: {created} | Total hours: {total_hours:.2f}h")
+    print(f"\nDone. Entries {mode}: {len(days)} | Total hours: {total_hours:.2f}h")
 
 if __name__ == "__main__":
     main()